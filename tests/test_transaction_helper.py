@@ -0,0 +1,411 @@
+import asyncio
+import gc
+import time
+import types
+import unittest
+import weakref
+from datetime import datetime
+from itertools import islice
+from unittest import mock
+
+import requests
+import zeep.exceptions
+from netsuitesdk.internal.exceptions import NetSuiteError, NetSuiteRateLimitError
+
+import transaction_helper
+
+
+class StubClient:
+    """
+    NetSuiteClient stand-in serving num_records records
+
+    Pages hold server_page_size records when given, otherwise the page size of the
+    search preferences, like NetSuite does.
+    """
+
+    def __init__(self, num_records, server_page_size=None):
+        self.data = [types.SimpleNamespace(internalId=str(i), recordType='invoice') for i in range(num_records)]
+        self.server_page_size = server_page_size
+        self.calls = []
+        self.set_search_preferences(page_size=100)
+
+    def set_search_preferences(self, page_size=5, search_body_fields_only=True, return_search_columns=True):
+        self._search_preferences = types.SimpleNamespace(
+            pageSize=page_size,
+            bodyFieldsOnly=search_body_fields_only,
+            returnSearchColumns=return_search_columns,
+        )
+
+    def _result(self, page_index):
+        size = self.server_page_size or self._search_preferences.pageSize
+        total_pages = -(-len(self.data) // size)
+        records = self.data[(page_index - 1) * size:page_index * size] or None
+        return types.SimpleNamespace(
+            totalRecords=len(self.data),
+            pageSize=size,
+            totalPages=total_pages,
+            pageIndex=page_index,
+            searchId='search-id',
+            records=records,
+        )
+
+    def search_factory(self, type_name):
+        return types.SimpleNamespace()
+
+    def basic_search_factory(self, type_name, **kwargs):
+        return types.SimpleNamespace(**kwargs)
+
+    def SearchStringField(self, **kwargs):
+        return kwargs
+
+    def SearchEnumMultiSelectField(self, **kwargs):
+        return kwargs
+
+    def search(self, searchRecord):
+        self.calls.append(('search', 1))
+        # Results remember the page size the search ran with, later pages keep it
+        self.server_page_size = self.server_page_size or self._search_preferences.pageSize
+        return self._result(1)
+
+    def searchMoreWithId(self, searchId, pageIndex):
+        self.calls.append(('searchMoreWithId', pageIndex))
+        return self._result(pageIndex)
+
+
+class StubConnection:
+    """NetSuiteConnection stand-in, hashable by identity and weakly referenceable like the real one"""
+
+    def __init__(self, client):
+        self.client = client
+
+
+class PaginationTest(unittest.TestCase):
+
+    def test_server_page_size_smaller_than_requested(self):
+        # NetSuite pages by its own page size; a 100 record page is not the last one
+        # just because 1000 records per page were requested
+        connection = StubConnection(StubClient(350, server_page_size=100))
+        records = transaction_helper.get_transaction_data(connection, 'Invoice', page_size=1000)
+        self.assertEqual([r.internalId for r in records], [str(i) for i in range(350)])
+
+    def test_page_size_is_applied_through_search_preferences(self):
+        client = StubClient(2500)
+        client.set_search_preferences(page_size=100, search_body_fields_only=False)
+        records = transaction_helper.get_transaction_data(StubConnection(client), 'Invoice', page_size=1000)
+        self.assertEqual(len(records), 2500)
+        self.assertEqual(len(client.calls), 3)
+        # The client's own preferences are left as they were
+        self.assertEqual(client._search_preferences.pageSize, 100)
+        self.assertFalse(client._search_preferences.bodyFieldsOnly)
+
+    def test_get_invoices_returns_all_pages(self):
+        connection = StubConnection(StubClient(350))
+        self.assertEqual(len(transaction_helper.get_invoices(connection)), 350)
+
+    def test_stopping_within_first_page_fetches_no_more_pages(self):
+        client = StubClient(5000)
+        records = transaction_helper.iter_transaction_data(StubConnection(client), 'Invoice')
+        self.assertEqual(len(list(islice(records, 10))), 10)
+        records.close()
+        self.assertEqual(client.calls, [('search', 1)])
+
+    def test_get_transactions_multi_splits_by_type(self):
+        client = StubClient(300)
+        for record in client.data[::3]:
+            record.recordType = 'creditMemo'
+        records_by_type = transaction_helper.get_transactions_multi(
+            StubConnection(client), ['Invoice', 'CreditMemo'], project=lambda record: record.internalId
+        )
+        self.assertEqual(len(records_by_type['Invoice']), 200)
+        self.assertEqual(records_by_type['CreditMemo'][:2], ['0', '3'])
+        self.assertEqual(transaction_helper.get_transactions_multi(StubConnection(client), []), {})
+
+    def test_get_transactions_multi_projects_each_page_as_it_arrives(self):
+        client = StubClient(300, server_page_size=100)
+        calls_when_projected = {}
+
+        def project(record):
+            calls_when_projected.setdefault(record.internalId, len(client.calls))
+            return record.internalId
+
+        records_by_type = transaction_helper.get_transactions_multi(StubConnection(client), ['Invoice', 'CreditMemo'], project=project)
+        self.assertEqual(len(records_by_type['Invoice']), 300)
+        # Page 1 is projected before any later page is requested
+        self.assertEqual(calls_when_projected['0'], 1)
+
+    def test_rate_limit_falls_back_to_sequential_paging(self):
+        client = StubClient(950, server_page_size=100)
+        search_more = client.searchMoreWithId
+        rejected = []
+
+        def rate_limited(searchId, pageIndex):
+            # Reject the first request for page 3 like a busy account would
+            if pageIndex == 3 and not rejected:
+                rejected.append(pageIndex)
+                raise NetSuiteRateLimitError("SuiteTalk concurrent request limit exceeded. Request blocked")
+            return search_more(searchId, pageIndex)
+
+        client.searchMoreWithId = rate_limited
+        with self.assertLogs(transaction_helper.log, 'WARNING') as logs:
+            records = transaction_helper.get_transaction_data(StubConnection(client), 'Invoice')
+        self.assertIn('continuing sequentially', logs.output[0])
+        self.assertEqual(rejected, [3])
+        self.assertEqual(len(records), 950)
+
+
+class SequentialPrefetchTest(unittest.TestCase):
+
+    def search(self, client):
+        basic_search = transaction_helper._transaction_basic_search(StubConnection(client), 'Invoice')
+        return transaction_helper._search(client, 'Transaction', basic_search, page_size=100)
+
+    def test_collects_all_pages(self):
+        client = StubClient(550)
+        records = list(transaction_helper._iter_pages(self.search(client), max_workers=1))
+        self.assertEqual([record.internalId for record in records], [str(i) for i in range(550)])
+        self.assertEqual([page for _, page in client.calls], [1, 2, 3, 4, 5, 6])
+
+    def test_stopping_early_stops_the_producer(self):
+        client = StubClient(5000)
+        prefetchers = []
+
+        class RecordingPrefetchIterator(transaction_helper.PrefetchIterator):
+            def __init__(self, *args):
+                prefetchers.append(self)
+                super().__init__(*args)
+
+        with mock.patch.object(transaction_helper, 'PrefetchIterator', RecordingPrefetchIterator):
+            pages = transaction_helper._iter_page_lists(self.search(client), max_workers=1)
+            self.assertEqual(next(pages)[0].internalId, '0')
+            self.assertEqual(next(pages)[0].internalId, '100')
+            pages.close()
+
+        producer = prefetchers[0]._thread
+        producer.join(timeout=2)
+        self.assertFalse(producer.is_alive())
+        calls = list(client.calls)
+        # At most the page queued for the consumer and the one blocked on the queue
+        self.assertLessEqual(len(calls), 4)
+        time.sleep(0.2)
+        self.assertEqual(client.calls, calls)
+
+
+class AsyncWrapperTest(unittest.TestCase):
+
+    def test_aget_transactions_multi(self):
+        client = StubClient(250)
+        records_by_type = asyncio.run(
+            transaction_helper.aget_transactions_multi(StubConnection(client), ['Invoice', 'CreditMemo'])
+        )
+        self.assertEqual(len(records_by_type['Invoice']), 250)
+        self.assertEqual(records_by_type['CreditMemo'], [])
+
+    def test_aget_invoices(self):
+        records = asyncio.run(transaction_helper.aget_invoices(StubConnection(StubClient(150))))
+        self.assertEqual(len(records), 150)
+
+
+class ProjectionTest(unittest.TestCase):
+
+    def test_project_transaction_builds_rows(self):
+        client = StubClient(150)
+        first = client.data[0]
+        first.tranId = 'INV-1'
+        first.tranDate = datetime(2024, 1, 31)
+        first.entity = types.SimpleNamespace(name='Acme')
+        first.total = 12.5
+        rows = transaction_helper.get_transaction_data(
+            StubConnection(client), 'Invoice', project=transaction_helper.project_transaction
+        )
+        self.assertEqual(len(rows), 150)
+        self.assertTrue(all(isinstance(row, transaction_helper.TxnRow) for row in rows))
+        self.assertEqual(rows[0], transaction_helper.TxnRow(
+            internalId='0', tranId='INV-1', tranDate=datetime(2024, 1, 31), entity='Acme',
+            currency=None, total=12.5, status=None, memo=None,
+        ))
+        self.assertEqual(rows[149].internalId, '149')
+        self.assertIsNone(rows[149].total)
+
+
+class StrategyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = StubConnection(None)
+        self.cache = weakref.WeakKeyDictionary()
+        self.calls = []
+        self.results = {'first': [], 'second': ['record'], 'third': ['other']}
+
+    def strategy(self, name):
+        def run(ns_connection, page_size):
+            self.calls.append(name)
+            result = self.results[name]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return name, run
+
+    def run_strategies(self):
+        strategies = [self.strategy(name) for name in ('first', 'second', 'third')]
+        return transaction_helper._run_strategies(self.connection, self.cache, strategies, 100, 'records')
+
+    def test_winner_is_reused(self):
+        self.assertEqual(self.run_strategies(), ['record'])
+        self.calls.clear()
+        self.assertEqual(self.run_strategies(), ['record'])
+        self.assertEqual(self.calls, ['second'])
+
+    def test_winner_is_forgotten_when_it_raises(self):
+        self.run_strategies()
+        self.calls.clear()
+        self.results['second'] = NetSuiteError('gone')
+        self.assertEqual(self.run_strategies(), ['other'])
+        self.assertEqual(self.calls, ['second', 'first', 'second', 'third'])
+
+    def test_winner_is_forgotten_when_it_finds_nothing(self):
+        self.run_strategies()
+        self.calls.clear()
+        self.results['second'] = []
+        self.assertEqual(self.run_strategies(), ['other'])
+        self.assertEqual(self.calls, ['second', 'first', 'second', 'third'])
+        self.calls.clear()
+        self.results['third'] = []
+        self.assertIsNone(self.run_strategies())
+        self.assertNotIn(self.connection, self.cache)
+
+
+class MetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        transaction_helper.clear_cache()
+        self.results = [['first'], ['second']]
+        self.calls = 0
+
+        @transaction_helper.memoize_by_conn
+        def lookup(ns_connection):
+            self.calls += 1
+            return self.results.pop(0)
+
+        self.lookup = lookup
+        self.connection = StubConnection(None)
+
+    def test_results_are_cached_until_they_expire(self):
+        with mock.patch.object(transaction_helper.time, 'monotonic', return_value=1000):
+            self.assertEqual(self.lookup(self.connection), ['first'])
+            self.assertEqual(self.lookup(self.connection), ['first'])
+        self.assertEqual(self.calls, 1)
+        expired = 1000 + transaction_helper.META_CACHE_TTL
+        with mock.patch.object(transaction_helper.time, 'monotonic', return_value=expired):
+            self.assertEqual(self.lookup(self.connection), ['second'])
+        self.assertEqual(self.calls, 2)
+
+    def test_empty_results_are_not_cached(self):
+        self.results = [[], ['found']]
+        self.assertEqual(self.lookup(self.connection), [])
+        self.assertEqual(self.lookup(self.connection), ['found'])
+        self.assertEqual(self.calls, 2)
+
+    def test_clear_cache_for_one_connection(self):
+        other = StubConnection(None)
+        self.results = [['first'], ['other'], ['again']]
+        self.lookup(self.connection)
+        self.lookup(other)
+        transaction_helper.clear_cache(self.connection)
+        self.assertEqual(self.lookup(self.connection), ['again'])
+        self.assertEqual(self.lookup(other), ['other'])
+        self.assertEqual(self.calls, 3)
+
+    def test_entries_do_not_keep_the_connection_alive(self):
+        self.lookup(self.connection)
+        connection = weakref.ref(self.connection)
+        del self.connection
+        gc.collect()
+        self.assertIsNone(connection())
+
+
+class ThrottleDetectionTest(unittest.TestCase):
+
+    def test_throttle_errors(self):
+        error = NetSuiteRateLimitError("SuiteTalk concurrent request limit exceeded. Request blocked")
+        self.assertTrue(transaction_helper._is_throttled(error))
+        self.assertTrue(transaction_helper._is_throttled(zeep.exceptions.TransportError(status_code=429)))
+        self.assertFalse(transaction_helper._is_throttled(zeep.exceptions.Fault("Invalid internalId 4290")))
+
+
+class RetryTest(unittest.TestCase):
+
+    def test_rate_limit_error_is_retried(self):
+        attempts = []
+
+        def search():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise NetSuiteRateLimitError("SuiteTalk concurrent request limit exceeded. Request blocked")
+            return 'result'
+
+        backoff = transaction_helper.RETRY_BACKOFF
+        transaction_helper.RETRY_BACKOFF = 0
+        try:
+            self.assertEqual(transaction_helper._with_retry(search), 'result')
+        finally:
+            transaction_helper.RETRY_BACKOFF = backoff
+        self.assertEqual(len(attempts), 2)
+
+    def test_invalid_session_is_not_retried(self):
+        attempts = []
+
+        def search():
+            attempts.append(1)
+            raise NetSuiteError("Your connection has timed out", code='INVALID_SESSION')
+
+        with self.assertRaises(NetSuiteError):
+            transaction_helper._with_retry(search)
+        self.assertEqual(len(attempts), 1)
+
+
+class DiagnosticsTest(unittest.TestCase):
+
+    def test_unknown_types_are_reported_not_raised(self):
+        client = types.SimpleNamespace(_complex_types={'CustomList': object()})
+        client.get_complex_type = lambda type_name: client._complex_types[type_name]
+        report = transaction_helper.diagnose_available_types(StubConnection(client))
+        self.assertIn("✓ CustomList - Available", report)
+        self.assertIn("✗ journalEntry - Not available", report)
+
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def test_pool_is_opt_in_and_does_not_retry(self):
+        client = StubClient(10)
+        session = requests.Session()
+        custom_adapter = requests.adapters.HTTPAdapter()
+        session.mount('https://', custom_adapter)
+        client._client = types.SimpleNamespace(transport=types.SimpleNamespace(session=session))
+        connection = StubConnection(client)
+
+        transaction_helper.get_invoices(connection)
+        self.assertIs(session.get_adapter('https://example.com'), custom_adapter)
+
+        transaction_helper.configure_connection_pool(connection)
+        adapter = session.get_adapter('https://example.com')
+        self.assertIsNot(adapter, custom_adapter)
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_pool_is_remounted_when_the_size_changes(self):
+        client = StubClient(10)
+        session = requests.Session()
+        client._client = types.SimpleNamespace(transport=types.SimpleNamespace(session=session))
+        connection = StubConnection(client)
+
+        transaction_helper.configure_connection_pool(connection, pool_size=4)
+        adapter = session.get_adapter('https://example.com')
+        transaction_helper.configure_connection_pool(connection, pool_size=4)
+        self.assertIs(session.get_adapter('https://example.com'), adapter)
+
+        transaction_helper.configure_connection_pool(connection, pool_size=20)
+        resized = session.get_adapter('https://example.com')
+        self.assertIsNot(resized, adapter)
+        self.assertEqual(resized._pool_maxsize, 20)
+
+if __name__ == '__main__':
+    unittest.main()
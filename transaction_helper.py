@@ -1,435 +1,980 @@
+import asyncio
+import copy
+import functools
+import logging
+import queue
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain, islice
+from typing import Optional
+
+import zeep.exceptions
+from netsuitesdk.internal.constants import GET_ALL_RECORD_TYPES
+from netsuitesdk.internal.exceptions import NetSuiteError, NetSuiteRateLimitError
 from netsuitesdk.internal.utils import PaginatedSearch
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, RequestException, Timeout
+
+log = logging.getLogger(__name__)
+
+# Records requested per search page. 1000 is the NetSuite maximum and minimises round-trips
+# for bulk extraction; interactive previews respond faster with 20-100 records per page.
+DEFAULT_PAGE_SIZE = 1000
+
+# Search preferences live on the shared client, so setting them and running the search
+# they apply to must not interleave between threads
+_SEARCH_PREFERENCES_LOCK = threading.Lock()
+
+# Fault codes of concurrency/rate limit violations that netsuitesdk passes through as a
+# plain zeep Fault; the common case arrives as NetSuiteRateLimitError instead
+THROTTLE_MARKERS = ('ExceededConcurrentRequestLimit', 'ExceededRequestLimit', 'WS_CONCUR_SESSION_DISALLWD')
+
+# Errors raised by NetSuite, zeep or the network. The get_* functions report these and
+# return empty results; anything else is a bug and propagates.
+NETSUITE_ERRORS = (zeep.exceptions.Error, NetSuiteError, RequestException)
+
+# SOAP fault codes that usually succeed when the call is simply repeated. INVALID_SESSION
+# is not one of them: repeating the call without logging in again fails the same way.
+TRANSIENT_FAULT_CODES = ('UNEXPECTED_ERROR', 'SESSION_TIMED_OUT')
+
+# Attempts per search before a transient error is given up on, with exponential backoff
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_WAIT = 5
+
+# TransactionSearchBasic.type takes TransactionType enum values, which do not always
+# follow the record type name
+TRANSACTION_TYPE_ENUMS = {
+    'Invoice': '_invoice',
+    'VendorCredit': '_vendorCredit',
+    'CreditMemo': '_creditMemo',
+    'JournalEntry': '_journal',
+}
+
+# Record types NetSuite returns in full from a single getAll call
+_GET_ALL_TYPES = set(GET_ALL_RECORD_TYPES)
+
+# Complex types worth listing in diagnose_available_types
+_DIAG_RE = re.compile(r'journal|segment|list|usage|custom', re.IGNORECASE)
+
+# Metadata lookups are served from memory for this many seconds per connection
+META_CACHE_TTL = 600
+
+# Cached lookups per connection, dropped together with the connection
+_META_CACHE = weakref.WeakKeyDictionary()
+
+def memoize_by_conn(func):
+    """
+    Cache the result of a metadata lookup per NetSuite connection and arguments
+    
+    Connections hash by identity and are only weakly referenced, so a connection that is
+    no longer used is freed along with its entries. Entries expire after META_CACHE_TTL
+    seconds. Empty results are not cached, so a failed lookup is retried.
+    """
+    @functools.wraps(func)
+    def wrapper(ns_connection, *args, **kwargs):
+        entries = _META_CACHE.setdefault(ns_connection, {})
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        entry = entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                return copy.copy(value)
+            del entries[key]
+        
+        value = func(ns_connection, *args, **kwargs)
+        if value:
+            entries[key] = (time.monotonic() + META_CACHE_TTL, value)
+        return copy.copy(value)
+    
+    return wrapper
+
+def clear_cache(ns_connection=None):
+    """Invalidate cached metadata, for one connection or for all of them"""
+    if ns_connection is None:
+        _META_CACHE.clear()
+        return
+    _META_CACHE.pop(ns_connection, None)
+
+# HTTPS connections kept open per NetSuite host, enough for the parallel page fetches
+CONNECTION_POOL_SIZE = 16
+
+# Pool size mounted on each configured requests session
+_POOLED_SESSIONS = weakref.WeakKeyDictionary()
+
+def configure_connection_pool(ns_connection, pool_size=CONNECTION_POOL_SIZE):
+    """
+    Let all SOAP calls of a connection reuse persistent HTTPS connections
+    
+    Mounts an HTTPAdapter with a pool of pool_size connections on the requests session
+    of the zeep transport, so parallel page fetches do not pay a TCP and TLS handshake
+    per request. The default adapter of requests already keeps 10 connections per host,
+    more than the 8 page workers, so this only matters when pages are fetched with more
+    than 10 workers. It replaces any adapter already mounted for https://, so it is only
+    applied when called. Failed requests are retried by the searches themselves, not by
+    the adapter. Calling it again with the same pool_size does nothing; a different
+    pool_size mounts a new adapter.
+    
+    Args:
+        ns_connection: NetSuite connection object
+        pool_size: Number of connections kept open per host
+    """
+    session = ns_connection.client._client.transport.session
+    if _POOLED_SESSIONS.get(session) == pool_size:
+        return
+    
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    _POOLED_SESSIONS[session] = pool_size
+
+def _fetch_page(ps, page):
+    """
+    Fetch a single page of an already executed search
+    
+    goto_page() rebinds the result attributes of the search it is called on, so every
+    page is fetched on a shallow copy; the copies share the client and the searchId
+    but never each other's results.
+    """
+    page_search = copy.copy(ps)
+    page_search.goto_page(page)
+    return page_search.records or []
+
+def _is_last_page(page_records, page_size):
+    """
+    Check whether a page ends the result set
+    
+    A page holding fewer records than the page size is provably the last one, even when
+    total_pages is stale or overestimated. page_size must be the size NetSuite applied
+    (ps.page_size), not the one requested: the server may use a different one.
+    """
+    return len(page_records) < page_size
+
+def _is_throttled(error):
+    """Check whether an error is NetSuite refusing a request because of concurrency limits"""
+    if isinstance(error, NetSuiteRateLimitError):
+        return True
+    if isinstance(error, zeep.exceptions.TransportError) and error.status_code == 429:
+        return True
+    message = str(error)
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+def _is_transient(error):
+    """Check whether an error is likely to go away when the call is repeated"""
+    # Rate limiting is the most common transient failure, including NetSuiteRateLimitError
+    if _is_throttled(error):
+        return True
+    if isinstance(error, (RequestsConnectionError, Timeout)):
+        return True
+    message = str(error)
+    return any(code in message for code in TRANSIENT_FAULT_CODES)
+
+def _with_retry(func, *args):
+    """
+    Call func(*args), retrying transient NetSuite errors with exponential backoff
+    
+    Waits RETRY_BACKOFF seconds after the first failure, doubling up to RETRY_MAX_WAIT,
+    and re-raises after RETRY_ATTEMPTS attempts or on any non-transient error.
+    """
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return func(*args)
+        except NETSUITE_ERRORS as e:
+            if attempt == RETRY_ATTEMPTS or not _is_transient(e):
+                raise
+            wait = min(RETRY_BACKOFF * 2 ** (attempt - 1), RETRY_MAX_WAIT)
+            log.debug("Transient error on attempt %d, retrying in %.1fs: %s", attempt, wait, e)
+            time.sleep(wait)
+
+class PrefetchIterator:
+    """
+    Iterate the pages of a search while a background thread fetches the next one
+    
+    The producer keeps exactly one page queued ahead of the consumer, so the round-trip
+    for page N+1 overlaps with the processing of page N without adding server load.
+    """
+    _DONE = object()
+    
+    def __init__(self, ps, pages, page_size):
+        self._queue = queue.Queue(maxsize=1)
+        self._stopped = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce, args=(ps, pages, page_size), daemon=True)
+        self._thread.start()
+    
+    def _put(self, item):
+        # Poll so a consumer that stopped early does not leave the producer blocked forever
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _produce(self, ps, pages, page_size):
+        try:
+            for page in pages:
+                page_records = _fetch_page(ps, page)
+                if not self._put(page_records):
+                    return
+                if _is_last_page(page_records, page_size):
+                    break
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(self._DONE)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is self._DONE:
+            self.close()
+            raise StopIteration
+        if isinstance(item, Exception):
+            self.close()
+            raise item
+        return item
+    
+    def close(self):
+        """Stop the producer thread"""
+        self._finished = True
+        self._stopped.set()
+
+def _iter_prefetched(ps, pages, page_size):
+    """Yield the records of the given pages page by page, prefetching the next page"""
+    prefetch = PrefetchIterator(ps, pages, page_size)
+    try:
+        yield from prefetch
+    finally:
+        prefetch.close()
+
+def _iter_page_lists(ps, max_workers=8):
+    """
+    Lazily yield the pages of a paginated search, fetching them concurrently
+    
+    The initial search already returned page 1, so only pages 2 onwards are requested,
+    and paging stops at the first empty or short page.
+    No page is requested before the consumer moves past page 1, and then at most
+    max_workers pages ahead of it, so stopping early (e.g. with itertools.islice) leaves
+    the remaining pages unfetched.
+    
+    Args:
+        ps: PaginatedSearch whose initial search has been performed
+        max_workers: Number of pages requested at the same time, 1 fetches sequentially
+            with one page prefetched in the background
+    
+    Yields:
+        List of records for each page, in page order
+    """
+    if ps.num_records <= 0:
+        return
+    
+    # Page size reported by the search result, which is what NetSuite actually applied
+    page_size = ps.page_size
+    first_records = ps.records or []
+    yield first_records
+    if _is_last_page(first_records, page_size):
+        return
+    
+    pages = iter(range(2, ps.total_pages + 1))
+    if max_workers <= 1:
+        yield from _iter_prefetched(ps, pages, page_size)
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque((page, executor.submit(_fetch_page, ps, page)) for page in islice(pages, max_workers))
+    try:
+        while pending:
+            page, future = pending.popleft()
+            try:
+                page_records = future.result()
+            except Exception as e:
+                if not _is_throttled(e):
+                    raise
+                log.warning("Throttled while fetching pages in parallel, continuing sequentially: %s", e)
+                for _, queued in pending:
+                    queued.cancel()
+                yield from _iter_prefetched(ps, chain([page], [queued_page for queued_page, _ in pending], pages), page_size)
+                return
+            
+            if _is_last_page(page_records, page_size):
+                yield page_records
+                return
+            
+            # Keep the window full before handing the page to the consumer
+            next_page = next(pages, None)
+            if next_page is not None:
+                pending.append((next_page, executor.submit(_fetch_page, ps, next_page)))
+            yield page_records
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _iter_pages(ps, max_workers=8, project=None):
+    """
+    Lazily yield the records of a paginated search one by one, see _iter_page_lists
+    
+    When project is given, each record is replaced by project(record).
+    """
+    pages = _iter_page_lists(ps, max_workers)
+    try:
+        for page_records in pages:
+            if project is not None:
+                page_records = map(project, page_records)
+            yield from page_records
+    finally:
+        pages.close()
+
+def _collect_pages(ps, max_workers=8, project=None):
+    """
+    Fetch all records of a paginated search into a list, see _iter_page_lists
+    
+    The list is allocated for total_records (the records of all pages) up front and
+    filled page by page, instead of being regrown by every extend(). When project is
+    given, each page is projected before it is stored, so the full zeep objects can be
+    freed page by page.
+    """
+    records = [None] * max(ps.total_records or 0, 0)
+    offset = 0
+    for page_records in _iter_page_lists(ps, max_workers):
+        if project is not None:
+            page_records = [project(record) for record in page_records]
+        records[offset:offset + len(page_records)] = page_records
+        offset += len(page_records)
+    # Trim the tail when fewer records came back than the search announced
+    del records[offset:]
+    return records
+
+def _search(client, type_name, basic_search=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Perform the initial search of a PaginatedSearch with the given page size
+    
+    NetSuite takes the page size from the client's search preferences, not from
+    PaginatedSearch, so they are set for this search and restored afterwards; the other
+    preferences are kept. The page size actually applied is available as ps.page_size.
+    """
+    with _SEARCH_PREFERENCES_LOCK:
+        preferences = client._search_preferences
+        client.set_search_preferences(
+            page_size=page_size,
+            search_body_fields_only=preferences.bodyFieldsOnly,
+            return_search_columns=preferences.returnSearchColumns
+        )
+        try:
+            return PaginatedSearch(
+                client=client,
+                type_name=type_name,
+                basic_search=basic_search
+            )
+        finally:
+            client.set_search_preferences(
+                page_size=preferences.pageSize,
+                search_body_fields_only=preferences.bodyFieldsOnly,
+                return_search_columns=preferences.returnSearchColumns
+            )
 
-def get_transaction_data(ns_connection, transaction_type):
+def _iter_paginate(client, type_name, basic_search=None, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """
+    Lazily yield all records of a search
+    
+    The initial search is retried on transient errors; records already handed to the
+    consumer cannot be taken back, so later page failures propagate.
+    
+    Args:
+        client: NetSuiteClient of the connection
+        type_name: Record type searched, e.g. 'Transaction'
+        basic_search: Optional basic search holding the filters
+        page_size: Records per search page
+        project: Optional callable applied to every record, e.g. project_transaction
+    
+    Yields:
+        Records (or their projections) from all pages, in page order
+    """
+    ps = _with_retry(_search, client, type_name, basic_search, page_size)
+    yield from _iter_pages(ps, project=project)
+
+def _fetch_all(client, type_name, basic_search, page_size, project):
+    """Run a search and collect all of its pages"""
+    return _collect_pages(_search(client, type_name, basic_search, page_size), project=project)
+
+def _paginate(client, type_name, basic_search=None, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """Fetch all records of a search into a list, retrying the whole search on transient errors"""
+    return _with_retry(_fetch_all, client, type_name, basic_search, page_size, project)
+
+# Winning fallback strategy per connection, see _run_strategies
+_JOURNAL_STRATEGY_CACHE = weakref.WeakKeyDictionary()
+_SEGMENT_STRATEGY_CACHE = weakref.WeakKeyDictionary()
+_USAGE_STRATEGY_CACHE = weakref.WeakKeyDictionary()
+
+def _run_strategies(ns_connection, cache, strategies, page_size, description):
+    """
+    Return the records of the first strategy that finds any, remembering the winner
+    
+    Once a strategy has returned records for a connection, later calls go straight to it
+    instead of paying the round-trips of the strategies that fail before it. When the
+    cached strategy raises or finds nothing, it is forgotten and all strategies are
+    probed again.
+    
+    Args:
+        ns_connection: NetSuite connection object
+        cache: WeakKeyDictionary mapping the connection to the winning (name, func)
+        strategies: List of (name, func) tried in order, func(ns_connection, page_size)
+        page_size: Records per search page
+        description: Name of the records, used in messages
+    
+    Returns:
+        List of records, or None if no strategy found any
+    """
+    cached = cache.get(ns_connection)
+    if cached is not None:
+        name, strategy = cached
+        try:
+            records = strategy(ns_connection, page_size)
+            if records:
+                return records
+            log.debug("Cached %s found no %s, probing again", name, description)
+        except NETSUITE_ERRORS as e:
+            log.debug("Cached %s failed, probing again: %s", name, e)
+        del cache[ns_connection]
+    
+    for name, strategy in strategies:
+        try:
+            records = strategy(ns_connection, page_size)
+            if records:
+                log.debug("Successfully got %d %s via %s", len(records), description, name)
+                cache[ns_connection] = (name, strategy)
+                return records
+        except NETSUITE_ERRORS as e:
+            log.debug("%s failed: %s", name, e)
+    
+    return None
+
+@dataclass(slots=True)
+class TxnRow:
+    """
+    Compact row holding the transaction columns the extraction uses
+    
+    A zeep record carries every field of its WSDL type in a dict; a slotted row with
+    only these columns takes a fraction of the memory on large extractions. Fields are
+    None when NetSuite leaves them out of the record.
+    """
+    internalId: Optional[str]
+    tranId: Optional[str]
+    tranDate: Optional[datetime]
+    entity: Optional[str]
+    currency: Optional[str]
+    total: Optional[float]
+    status: Optional[str]
+    memo: Optional[str]
+
+def _ref_name(ref):
+    """Display name of a RecordRef field, or None"""
+    return getattr(ref, 'name', None) if ref is not None else None
+
+def project_transaction(record):
+    """Project a transaction record to a TxnRow, for the project argument of the get_* functions"""
+    return TxnRow(
+        internalId=getattr(record, 'internalId', None),
+        tranId=getattr(record, 'tranId', None),
+        tranDate=getattr(record, 'tranDate', None),
+        entity=_ref_name(getattr(record, 'entity', None)),
+        currency=_ref_name(getattr(record, 'currency', None)),
+        total=getattr(record, 'total', None),
+        status=getattr(record, 'status', None),
+        memo=getattr(record, 'memo', None),
+    )
+
+def _transaction_basic_search(ns_connection, transaction_type):
+    """Basic Transaction search for a single record type"""
+    # Create search field for transaction type
+    search_field = ns_connection.client.SearchStringField(
+        searchValue=transaction_type, 
+        operator='is'
+    )
+    
+    # Create basic search
+    basic_search = ns_connection.client.basic_search_factory(
+        'Transaction', 
+        recordType=search_field
+    )
+    
+    return basic_search
+
+def iter_transaction_data(ns_connection, transaction_type, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """
+    Lazily iterate transaction data for types not in SEARCH_RECORD_TYPES
+    
+    Pages are fetched as the generator is consumed, so only the first N records can
+    be previewed with itertools.islice without downloading the whole table. Unlike
+    get_transaction_data, NETSUITE_ERRORS propagate instead of ending the iteration.
+    
+    Args:
+        ns_connection: NetSuite connection object
+        transaction_type: String like 'Invoice', 'VendorCredit', 'CreditMemo'
+        page_size: Records per search page; larger pages mean fewer round-trips,
+            smaller pages return the first records sooner
+        project: Optional callable applied to every record, e.g. project_transaction
+            to keep compact TxnRow rows instead of zeep objects
+    
+    Yields:
+        Transaction records
+    """
+    basic_search = _transaction_basic_search(ns_connection, transaction_type)
+    yield from _iter_paginate(ns_connection.client, 'Transaction', basic_search, page_size, project)
+
+def get_transaction_data(ns_connection, transaction_type, page_size=DEFAULT_PAGE_SIZE, project=None):
     """
     Get transaction data for types not in SEARCH_RECORD_TYPES
     
     Args:
         ns_connection: NetSuite connection object
         transaction_type: String like 'Invoice', 'VendorCredit', 'CreditMemo'
+        page_size: Records per search page; larger pages mean fewer round-trips,
+            smaller pages return the first records sooner
+        project: Optional callable applied to every record, e.g. project_transaction
+            to keep compact TxnRow rows instead of zeep objects
     
     Returns:
         List of transaction records
     """
     try:
-        # Create search field for transaction type
-        search_field = ns_connection.client.SearchStringField(
-            searchValue=transaction_type, 
-            operator='is'
-        )
-        
-        # Create basic search
-        basic_search = ns_connection.client.basic_search_factory(
-            'Transaction', 
-            recordType=search_field
-        )
-        
-        # Create paginated search
-        ps = PaginatedSearch(
-            client=ns_connection.client, 
-            type_name='Transaction', 
-            basic_search=basic_search,
-            pageSize=100
-        )
+        basic_search = _transaction_basic_search(ns_connection, transaction_type)
+        return _paginate(ns_connection.client, 'Transaction', basic_search, page_size, project)
         
-        # Get all records
-        records = []
-        if ps.num_records > 0:
-            for page in range(1, ps.total_pages + 1):
-                ps.goto_page(page)
-                if ps.records:
-                    records.extend(ps.records)
-        
-        return records
-        
-    except Exception as e:
-        print(f"Error getting {transaction_type} data: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting %s data: %s", transaction_type, e)
         return []
 
-def get_invoices(ns_connection):
+def _transaction_type_enum(transaction_type):
+    """TransactionType enum value for a record type name, e.g. 'VendorCredit' -> '_vendorCredit'"""
+    return TRANSACTION_TYPE_ENUMS.get(transaction_type, '_' + transaction_type[0].lower() + transaction_type[1:])
+
+def _record_type_name(record):
+    """Record type name of a search result, e.g. 'Invoice'"""
+    # A single getattr with a default instead of hasattr() followed by a second lookup
+    record_type = getattr(record, 'recordType', None)
+    if record_type:
+        return record_type
+    xsd_type = getattr(record, '_xsd_type', None)
+    return getattr(xsd_type, 'name', None) or type(record).__name__
+
+def _multi_transaction_basic_search(ns_connection, transaction_types):
+    """Basic Transaction search matching any of the given record types"""
+    # Create search field matching any of the transaction types
+    search_field = ns_connection.client.SearchEnumMultiSelectField(
+        searchValue=[_transaction_type_enum(t) for t in transaction_types],
+        operator='anyOf'
+    )
+    
+    # Create basic search
+    basic_search = ns_connection.client.basic_search_factory(
+        'Transaction',
+        type=search_field
+    )
+    
+    return basic_search
+
+def get_transactions_multi(ns_connection, transaction_types, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """
+    Get the transactions of several types with a single search
+    
+    One scan of the Transaction table replaces one search per type, so callers that need
+    e.g. invoices, vendor credits and credit memos should ask for all of them at once.
+    
+    Args:
+        ns_connection: NetSuite connection object
+        transaction_types: List of strings like 'Invoice', 'VendorCredit', 'CreditMemo'
+        page_size: Records per search page
+        project: Optional callable applied to every record, e.g. project_transaction
+    
+    Returns:
+        Dict mapping each transaction type to its list of records
+    """
+    if not transaction_types:
+        return {}
+    
+    records_by_type = {transaction_type: [] for transaction_type in transaction_types}
+    try:
+        basic_search = _multi_transaction_basic_search(ns_connection, transaction_types)
+        if len(transaction_types) == 1:
+            # Nothing to split, every result is of the requested type
+            records_by_type[transaction_types[0]] = _paginate(ns_connection.client, 'Transaction', basic_search, page_size, project)
+            return records_by_type
+        
+        # Results may name their type in a different case than the caller did. Each record
+        # is tagged with its type and projected as its page arrives, so only the reduced
+        # rows are kept until the split.
+        def tag(record):
+            return _record_type_name(record).lower(), record if project is None else project(record)
+        
+        # Collect first so a transient error retries the whole search instead of leaving
+        # the buckets half filled, then split the results by type
+        tagged = _paginate(ns_connection.client, 'Transaction', basic_search, page_size, tag)
+        
+        # Binding the append of each bucket up front keeps the per-record work to one lookup
+        appenders = {transaction_type.lower(): records_by_type[transaction_type].append for transaction_type in transaction_types}
+        get_appender = appenders.get
+        for record_type, record in tagged:
+            append = get_appender(record_type)
+            if append is not None:
+                append(record)
+        
+        return records_by_type
+        
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting %s data: %s", ', '.join(transaction_types), e)
+        return {transaction_type: [] for transaction_type in transaction_types}
+
+def get_invoices(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
     """Get all invoices"""
-    return get_transaction_data(ns_connection, 'Invoice')
+    return get_transactions_multi(ns_connection, ['Invoice'], page_size, project)['Invoice']
 
-def get_vendor_credits(ns_connection):
+def get_vendor_credits(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
     """Get all vendor credits"""
-    return get_transaction_data(ns_connection, 'VendorCredit')
+    return get_transactions_multi(ns_connection, ['VendorCredit'], page_size, project)['VendorCredit']
 
-def get_credit_memos(ns_connection):
+def get_credit_memos(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
     """Get all credit memos"""
-    return get_transaction_data(ns_connection, 'CreditMemo')
+    return get_transactions_multi(ns_connection, ['CreditMemo'], page_size, project)['CreditMemo']
+
+async def aget_transaction_data(ns_connection, transaction_type, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """
+    Async variant of get_transaction_data
+    
+    netsuitesdk only drives a synchronous zeep client, so the search runs in a worker
+    thread and the event loop stays free while it pages. Each search fetches its pages in
+    parallel on the connection's session, so several transaction types are best awaited as
+    one scan, aget_transactions_multi(conn, ['Invoice', 'VendorCredit', 'CreditMemo']),
+    rather than gathered, which runs a scan each and quickly hits the concurrency limit.
+    """
+    return await asyncio.to_thread(get_transaction_data, ns_connection, transaction_type, page_size, project)
+
+async def aget_transactions_multi(ns_connection, transaction_types, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """Async variant of get_transactions_multi, see aget_transaction_data"""
+    return await asyncio.to_thread(get_transactions_multi, ns_connection, transaction_types, page_size, project)
+
+async def aget_invoices(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """Get all invoices without blocking the event loop"""
+    return await asyncio.to_thread(get_invoices, ns_connection, page_size, project)
 
-def get_custom_lists(ns_connection):
+async def aget_vendor_credits(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """Get all vendor credits without blocking the event loop"""
+    return await asyncio.to_thread(get_vendor_credits, ns_connection, page_size, project)
+
+async def aget_credit_memos(ns_connection, page_size=DEFAULT_PAGE_SIZE, project=None):
+    """Get all credit memos without blocking the event loop"""
+    return await asyncio.to_thread(get_credit_memos, ns_connection, page_size, project)
+
+def _custom_list_basic_search(ns_connection):
+    """Basic CustomList search for all custom lists"""
+    # Create basic search for custom lists
+    return ns_connection.client.basic_search_factory('CustomList')
+
+def iter_custom_lists(ns_connection, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Lazily iterate all custom lists using search operation
+    
+    Unlike get_custom_lists, NETSUITE_ERRORS propagate instead of yielding nothing.
+    """
+    basic_search = _custom_list_basic_search(ns_connection)
+    yield from _iter_paginate(ns_connection.client, 'CustomList', basic_search, page_size)
+
+@memoize_by_conn
+def get_custom_lists(ns_connection, page_size=DEFAULT_PAGE_SIZE):
     """Get all custom lists using search operation"""
     try:
-        from netsuitesdk.internal.utils import PaginatedSearch
-        
-        # Create basic search for custom lists
-        basic_search = ns_connection.client.basic_search_factory('CustomList')
-        
-        # Create paginated search
-        ps = PaginatedSearch(
-            client=ns_connection.client, 
-            type_name='CustomList', 
-            basic_search=basic_search,
-            pageSize=100
-        )
+        basic_search = _custom_list_basic_search(ns_connection)
+        return _paginate(ns_connection.client, 'CustomList', basic_search, page_size)
         
-        # Get all records
-        records = []
-        if ps.num_records > 0:
-            for page in range(1, ps.total_pages + 1):
-                ps.goto_page(page)
-                if ps.records:
-                    records.extend(ps.records)
-        
-        return records
-        
-    except Exception as e:
-        print(f"Error getting custom lists: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting custom lists: %s", e)
         return []
 
-def get_journal_entries(ns_connection):
+def _journal_entries_non_memorized(ns_connection, page_size):
+    """Approach 1: Search for non-memorized journal entries"""
+    # Create a search that excludes memorized transactions
+    is_memorized_field = ns_connection.client.SearchBooleanField(searchValue=False)
+    basic_search = ns_connection.client.basic_search_factory(
+        'Transaction',
+        isMemorized=is_memorized_field
+    )
+    
+    # Add record type filter for journal entries
+    record_type_field = ns_connection.client.SearchStringField(searchValue='JournalEntry', operator='is')
+    basic_search.recordType = record_type_field
+    
+    return _paginate(ns_connection.client, 'Transaction', basic_search, page_size)
+
+def _journal_entries_by_type(ns_connection, page_size):
+    """
+    Approach 2: Search on the transaction type enum instead of recordType
+    
+    Filtering happens on the server. Fetching every transaction and keeping the journal
+    entries in Python would download the whole Transaction table to keep a fraction of it.
+    """
+    basic_search = _multi_transaction_basic_search(ns_connection, ['JournalEntry'])
+    return _paginate(ns_connection.client, 'Transaction', basic_search, page_size)
+
+JOURNAL_ENTRY_STRATEGIES = [
+    ('non-memorized search', _journal_entries_non_memorized),
+    ('type search', _journal_entries_by_type),
+]
+
+def get_journal_entries(ns_connection, page_size=DEFAULT_PAGE_SIZE):
     """Get all journal entries using a different approach to avoid memorized transaction error"""
     try:
-        from netsuitesdk.internal.utils import PaginatedSearch
+        records = _run_strategies(ns_connection, _JOURNAL_STRATEGY_CACHE, JOURNAL_ENTRY_STRATEGIES, page_size, 'journal entries')
+        if records is not None:
+            return records
         
-        # Create a search that excludes memorized transactions
-        # Try to create a basic search with specific filters
-        try:
-            # Approach 1: Search for non-memorized journal entries
-            is_memorized_field = ns_connection.client.SearchBooleanField(searchValue=False)
-            basic_search = ns_connection.client.basic_search_factory(
-                'Transaction',
-                isMemorized=is_memorized_field
-            )
-            
-            # Add record type filter for journal entries
-            record_type_field = ns_connection.client.SearchStringField(searchValue='JournalEntry', operator='is')
-            basic_search.recordType = record_type_field
-            
-            ps = PaginatedSearch(
-                client=ns_connection.client,
-                type_name='Transaction',
-                basic_search=basic_search,
-                pageSize=100
-            )
-            
-            records = []
-            if ps.num_records > 0:
-                for page in range(1, ps.total_pages + 1):
-                    ps.goto_page(page)
-                    if ps.records:
-                        records.extend(ps.records)
-            
-            if records:
-                print(f"Successfully got {len(records)} journal entries (non-memorized)")
-                return records
-                
-        except Exception as e:
-            print(f"Approach 1 failed: {e}")
-        
-        # Approach 2: Try direct search without memorized filter
-        try:
-            ps = PaginatedSearch(
-                client=ns_connection.client,
-                type_name='Transaction',
-                pageSize=100
-            )
-            
-            records = []
-            if ps.num_records > 0:
-                for page in range(1, ps.total_pages + 1):
-                    ps.goto_page(page)
-                    if ps.records:
-                        # Filter for journal entries manually
-                        journal_records = [r for r in ps.records if hasattr(r, 'recordType') and r.recordType == 'JournalEntry']
-                        records.extend(journal_records)
-            
-            if records:
-                print(f"Successfully got {len(records)} journal entries (filtered)")
-                return records
-                
-        except Exception as e:
-            print(f"Approach 2 failed: {e}")
-        
-        print("All approaches failed for journal entries")
+        log.warning("All approaches failed for journal entries")
         return []
         
-    except Exception as e:
-        print(f"Error getting journal entries: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting journal entries: %s", e)
         return []
 
-def get_custom_records(ns_connection, rec_type_id):
+def _custom_record_basic_search(ns_connection, rec_type_id):
+    """Basic CustomRecord search for a custom record type"""
+    # Create custom record type reference
+    custom_record_type = ns_connection.client.CustomRecordType(internalId=rec_type_id)
+    
+    # Create search basic
+    search_basic = ns_connection.client.CustomRecordSearchBasic(recType=custom_record_type)
+    
+    return search_basic
+
+def iter_custom_records(ns_connection, rec_type_id, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Lazily iterate custom records by type ID
+    
+    Unlike get_custom_records, NETSUITE_ERRORS propagate instead of yielding nothing.
+    """
+    search_basic = _custom_record_basic_search(ns_connection, rec_type_id)
+    yield from _iter_paginate(ns_connection.client, 'CustomRecord', search_basic, page_size)
+
+def get_custom_records(ns_connection, rec_type_id, page_size=DEFAULT_PAGE_SIZE):
     """Get custom records by type ID"""
     try:
-        from netsuitesdk.internal.utils import PaginatedSearch
+        search_basic = _custom_record_basic_search(ns_connection, rec_type_id)
+        return _paginate(ns_connection.client, 'CustomRecord', search_basic, page_size)
         
-        # Create custom record type reference
-        custom_record_type = ns_connection.client.CustomRecordType(internalId=rec_type_id)
-        
-        # Create search basic
-        search_basic = ns_connection.client.CustomRecordSearchBasic(recType=custom_record_type)
-        
-        # Create paginated search
-        ps = PaginatedSearch(
-            client=ns_connection.client, 
-            type_name='CustomRecord', 
-            basic_search=search_basic,
-            pageSize=100
-        )
-        
-        # Get all records
-        records = []
-        if ps.num_records > 0:
-            for page in range(1, ps.total_pages + 1):
-                ps.goto_page(page)
-                if ps.records:
-                    records.extend(ps.records)
-        
-        return records
-        
-    except Exception as e:
-        print(f"Error getting custom records: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting custom records: %s", e)
+        return []
+
+async def aget_custom_records(ns_connection, rec_type_id, page_size=DEFAULT_PAGE_SIZE):
+    """Get custom records by type ID without blocking the event loop"""
+    return await asyncio.to_thread(get_custom_records, ns_connection, rec_type_id, page_size)
+
+def _custom_segments_direct_search(ns_connection, page_size):
+    """Approach 2: Direct search without specific search class"""
+    return _paginate(ns_connection.client, 'CustomSegment', page_size=page_size)
+
+def _custom_segments_get_all(ns_connection, page_size):
+    """Approach 1: getAll, a single unpaginated call, if custom segments are in GET_ALL_RECORD_TYPES"""
+    if 'customSegment' not in _GET_ALL_TYPES:
         return []
+    return ns_connection.client.getAll(recordType='CustomSegment')
 
-def get_custom_segments(ns_connection):
+CUSTOM_SEGMENT_STRATEGIES = [
+    ('getAll', _custom_segments_get_all),
+    ('direct search', _custom_segments_direct_search),
+]
+
+def get_custom_segments(ns_connection, page_size=DEFAULT_PAGE_SIZE):
     """Get all custom segments using the correct search approach"""
     try:
-        from netsuitesdk.internal.utils import PaginatedSearch
-        
         # Since CustomSegmentSearch doesn't exist, try using the base search
         # Custom segments might be accessible through a different approach
-        
-        # Approach 1: Try direct search without specific search class
-        try:
-            ps = PaginatedSearch(
-                client=ns_connection.client, 
-                type_name='CustomSegment', 
-                pageSize=100
-            )
-            
-            records = []
-            if ps.num_records > 0:
-                for page in range(1, ps.total_pages + 1):
-                    ps.goto_page(page)
-                    if ps.records:
-                        records.extend(ps.records)
-            
-            if records:
-                print(f"Successfully got {len(records)} custom segments")
-                return records
-                
-        except Exception as e:
-            print(f"Direct search failed: {e}")
-        
-        # Approach 2: Try using getAll if it's in GET_ALL_RECORD_TYPES
-        try:
-            from netsuitesdk.internal.constants import GET_ALL_RECORD_TYPES
-            if 'customSegment' in GET_ALL_RECORD_TYPES:
-                records = ns_connection.client.getAll(recordType='CustomSegment')
-                if records:
-                    print(f"Successfully got {len(records)} custom segments via getAll")
-                    return records
-        except Exception as e:
-            print(f"getAll approach failed: {e}")
+        records = _run_strategies(ns_connection, _SEGMENT_STRATEGY_CACHE, CUSTOM_SEGMENT_STRATEGIES, page_size, 'custom segments')
+        if records is not None:
+            return records
         
         # Approach 3: Try to find custom segments through a different entity
         # Sometimes custom segments are accessible through other means
         try:
             # Try searching for custom segments through custom lists
-            custom_lists = get_custom_lists(ns_connection)
+            custom_lists = get_custom_lists(ns_connection, page_size)
             if custom_lists:
-                print(f"Found {len(custom_lists)} custom lists, but no direct custom segments")
+                log.debug("Found %d custom lists, but no direct custom segments", len(custom_lists))
                 return []
-        except Exception as e:
-            print(f"Custom lists approach failed: {e}")
+        except NETSUITE_ERRORS as e:
+            log.debug("Custom lists approach failed: %s", e)
         
-        print("All approaches failed for custom segments")
+        log.warning("All approaches failed for custom segments")
         return []
         
-    except Exception as e:
-        print(f"Error getting custom segments: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting custom segments: %s", e)
         return []
 
-def discover_custom_record_types(ns_connection):
+def _custom_record_type_basic_search(ns_connection):
+    """Basic CustomRecordType search for all custom record types"""
+    # Try to get all custom record types using a basic search without specific filters
+    return ns_connection.client.basic_search_factory('CustomRecordType')
+
+def iter_custom_record_types(ns_connection, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Lazily iterate available custom record types
+    
+    Unlike discover_custom_record_types, NETSUITE_ERRORS propagate instead of yielding
+    nothing.
+    """
+    basic_search = _custom_record_type_basic_search(ns_connection)
+    yield from _iter_paginate(ns_connection.client, 'CustomRecordType', basic_search, page_size)
+
+@memoize_by_conn
+def discover_custom_record_types(ns_connection, page_size=DEFAULT_PAGE_SIZE):
     """Discover available custom record types"""
     try:
-        # Try to get all custom record types using a broad search
-        from netsuitesdk.internal.utils import PaginatedSearch
-        
-        # Create a basic search without specific filters
-        basic_search = ns_connection.client.basic_search_factory('CustomRecordType')
-        
-        # Create paginated search
-        ps = PaginatedSearch(
-            client=ns_connection.client, 
-            type_name='CustomRecordType', 
-            basic_search=basic_search,
-            pageSize=100
-        )
-        
-        # Get all records
-        records = []
-        if ps.num_records > 0:
-            for page in range(1, ps.total_pages + 1):
-                ps.goto_page(page)
-                if ps.records:
-                    records.extend(ps.records)
+        basic_search = _custom_record_type_basic_search(ns_connection)
+        return _paginate(ns_connection.client, 'CustomRecordType', basic_search, page_size)
         
-        return records
-        
-    except Exception as e:
-        print(f"Error discovering custom record types: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error discovering custom record types: %s", e)
         return []
 
-def get_custom_record_types_by_name(ns_connection, type_name):
+def _custom_record_type_name_basic_search(ns_connection, type_name):
+    """Basic CustomRecordType search for names containing type_name"""
+    # Create search field for type name
+    search_field = ns_connection.client.SearchStringField(
+        searchValue=type_name, 
+        operator='contains'
+    )
+    
+    # Create basic search
+    basic_search = ns_connection.client.basic_search_factory(
+        'CustomRecordType', 
+        name=search_field
+    )
+    
+    return basic_search
+
+def iter_custom_record_types_by_name(ns_connection, type_name, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Lazily iterate custom record types by name
+    
+    Unlike get_custom_record_types_by_name, NETSUITE_ERRORS propagate instead of yielding
+    nothing.
+    """
+    basic_search = _custom_record_type_name_basic_search(ns_connection, type_name)
+    yield from _iter_paginate(ns_connection.client, 'CustomRecordType', basic_search, page_size)
+
+def get_custom_record_types_by_name(ns_connection, type_name, page_size=DEFAULT_PAGE_SIZE):
     """Get custom record types by name"""
     try:
-        from netsuitesdk.internal.utils import PaginatedSearch
-        
-        # Create search field for type name
-        search_field = ns_connection.client.SearchStringField(
-            searchValue=type_name, 
-            operator='contains'
-        )
-        
-        # Create basic search
-        basic_search = ns_connection.client.basic_search_factory(
-            'CustomRecordType', 
-            name=search_field
-        )
-        
-        # Create paginated search
-        ps = PaginatedSearch(
-            client=ns_connection.client, 
-            type_name='CustomRecordType', 
-            basic_search=basic_search,
-            pageSize=100
-        )
-        
-        # Get all records
-        records = []
-        if ps.num_records > 0:
-            for page in range(1, ps.total_pages + 1):
-                ps.goto_page(page)
-                if ps.records:
-                    records.extend(ps.records)
+        basic_search = _custom_record_type_name_basic_search(ns_connection, type_name)
+        return _paginate(ns_connection.client, 'CustomRecordType', basic_search, page_size)
         
-        return records
-        
-    except Exception as e:
-        print(f"Error getting custom record types by name: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting custom record types by name: %s", e)
         return []
 
-def get_usages(ns_connection):
+def _usages_direct_search(ns_connection, page_size):
+    """Approach 2: Direct search without specific search class"""
+    return _paginate(ns_connection.client, 'Usage', page_size=page_size)
+
+def _usages_get_all(ns_connection, page_size):
+    """Approach 1: getAll, a single unpaginated call, if usages are in GET_ALL_RECORD_TYPES"""
+    if 'usage' not in _GET_ALL_TYPES:
+        return []
+    return ns_connection.client.getAll(recordType='Usage')
+
+def _usages_transaction_search(ns_connection, page_size):
+    """Approach 3: Transaction search for usage records"""
+    # Paginate directly rather than via get_transaction_data, which would swallow errors
+    basic_search = _transaction_basic_search(ns_connection, 'Usage')
+    return _paginate(ns_connection.client, 'Transaction', basic_search, page_size)
+
+def _usages_basic_search(ns_connection, page_size):
+    """Approach 4: Search with a basic search created manually"""
+    # Create a basic search without specific search class
+    basic_search = ns_connection.client.basic_search_factory('Usage')
+    return _paginate(ns_connection.client, 'Usage', basic_search, page_size)
+
+USAGE_STRATEGIES = [
+    ('getAll', _usages_get_all),
+    ('direct search', _usages_direct_search),
+    ('transaction search', _usages_transaction_search),
+    ('basic search', _usages_basic_search),
+]
+
+def get_usages(ns_connection, page_size=DEFAULT_PAGE_SIZE):
     """Get all usages using the correct approach"""
     try:
         # Since UsageSearch doesn't exist, try different approaches
+        records = _run_strategies(ns_connection, _USAGE_STRATEGY_CACHE, USAGE_STRATEGIES, page_size, 'usages')
+        if records is not None:
+            return records
         
-        # Approach 1: Try direct search without specific search class
-        try:
-            from netsuitesdk.internal.utils import PaginatedSearch
-            
-            ps = PaginatedSearch(
-                client=ns_connection.client, 
-                type_name='Usage', 
-                pageSize=100
-            )
-            
-            records = []
-            if ps.num_records > 0:
-                for page in range(1, ps.total_pages + 1):
-                    ps.goto_page(page)
-                    if ps.records:
-                        records.extend(ps.records)
-            
-            if records:
-                print(f"Successfully got {len(records)} usages via direct search")
-                return records
-                
-        except Exception as e:
-            print(f"Direct search failed: {e}")
-        
-        # Approach 2: Try using getAll if it's in GET_ALL_RECORD_TYPES
-        try:
-            from netsuitesdk.internal.constants import GET_ALL_RECORD_TYPES
-            if 'usage' in GET_ALL_RECORD_TYPES:
-                records = ns_connection.client.getAll(recordType='Usage')
-                if records:
-                    print(f"Successfully got {len(records)} usages via getAll")
-                    return records
-        except Exception as e:
-            print(f"getAll approach failed: {e}")
-        
-        # Approach 3: Try transaction search for usage records
-        try:
-            records = get_transaction_data(ns_connection, 'Usage')
-            if records:
-                print(f"Successfully got {len(records)} usages via transaction search")
-                return records
-        except Exception as e:
-            print(f"Transaction search failed: {e}")
-        
-        # Approach 4: Try to create usage records manually and search
-        try:
-            # Try to create a basic search manually
-            from netsuitesdk.internal.utils import PaginatedSearch
-            
-            # Create a basic search without specific search class
-            basic_search = ns_connection.client.basic_search_factory('Usage')
-            
-            ps = PaginatedSearch(
-                client=ns_connection.client, 
-                type_name='Usage', 
-                basic_search=basic_search,
-                pageSize=100
-            )
-            
-            records = []
-            if ps.num_records > 0:
-                for page in range(1, ps.total_pages + 1):
-                    ps.goto_page(page)
-                    if ps.records:
-                        records.extend(ps.records)
-            
-            if records:
-                print(f"Successfully got {len(records)} usages via basic search")
-                return records
-                
-        except Exception as e:
-            print(f"Basic search failed: {e}")
-        
-        print("All approaches failed for usages")
+        log.warning("All approaches failed for usages")
         return []
         
-    except Exception as e:
-        print(f"Error getting usages: {e}")
+    except NETSUITE_ERRORS as e:
+        log.warning("Error getting usages: %s", e)
         return []
 
+@memoize_by_conn
+def _collect_type_diagnostics(ns_connection):
+    """Collect the search types, the relevant complex types and the availability of specific types"""
+    from netsuitesdk.internal.constants import SEARCH_RECORD_TYPES
+    
+    # Filter for relevant types with one case-insensitive scan per name
+    relevant_types = [t for t in ns_connection.client._complex_types if _DIAG_RE.search(t)]
+    
+    test_types = ['JournalEntry', 'journalEntry', 'CustomSegment', 'CustomList', 'Usage']
+    availability = {}
+    for test_type in test_types:
+        try:
+            # Try to get the complex type
+            ns_connection.client.get_complex_type(test_type)
+            availability[test_type] = True
+        except (KeyError, *NETSUITE_ERRORS):
+            # get_complex_type is a plain dict lookup, unknown names raise KeyError
+            availability[test_type] = False
+    
+    return {
+        'search_types': list(SEARCH_RECORD_TYPES),
+        'complex_types': relevant_types,
+        'availability': availability,
+    }
+
 def diagnose_available_types(ns_connection):
-    """Diagnose what types are available in the NetSuite client"""
+    """
+    Diagnose what types are available in the NetSuite client
+    
+    The report is logged in one INFO message and returned.
+    """
     try:
-        print("=== Available Search Types ===")
-        from netsuitesdk.internal.constants import SEARCH_RECORD_TYPES
-        for i, search_type in enumerate(SEARCH_RECORD_TYPES, 1):
-            print(f"{i:3d}. {search_type}")
+        diagnostics = _collect_type_diagnostics(ns_connection)
         
-        print("\n=== Available Complex Types (partial) ===")
-        complex_types = list(ns_connection.client._complex_types.keys())
-        # Filter for relevant types
-        relevant_types = [t for t in complex_types if any(x in t.lower() for x in ['journal', 'segment', 'list', 'usage', 'custom'])]
-        for i, complex_type in enumerate(relevant_types, 1):
-            print(f"{i:3d}. {complex_type}")
+        lines = ["=== Available Search Types ==="]
+        lines.extend(f"{i:3d}. {search_type}" for i, search_type in enumerate(diagnostics['search_types'], 1))
         
-        print("\n=== Testing Specific Types ===")
-        test_types = ['JournalEntry', 'journalEntry', 'CustomSegment', 'CustomList', 'Usage']
-        for test_type in test_types:
-            try:
-                # Try to get the complex type
-                complex_type = ns_connection.client.get_complex_type(test_type)
-                print(f"✓ {test_type} - Available")
-            except:
-                print(f"✗ {test_type} - Not available")
+        lines.append("\n=== Available Complex Types (partial) ===")
+        lines.extend(f"{i:3d}. {complex_type}" for i, complex_type in enumerate(diagnostics['complex_types'], 1))
+        
+        lines.append("\n=== Testing Specific Types ===")
+        for test_type, available in diagnostics['availability'].items():
+            if available:
+                lines.append(f"✓ {test_type} - Available")
+            else:
+                lines.append(f"✗ {test_type} - Not available")
+        
+        report = "\n".join(lines)
+        log.info("%s", report)
+        return report
                 
-    except Exception as e:
-        print(f"Error in diagnosis: {e}")
\ No newline at end of file
+    except NETSUITE_ERRORS as e:
+        log.warning("Error in diagnosis: %s", e)
+        return ""